@@ -1,6 +1,5 @@
 # 将下面整个文件替换到你的 main.py
 import sys
-import csv
 import time
 import numpy as np
 from collections import deque
@@ -17,12 +16,14 @@ import pyqtgraph as pg
 from serial_manager import SerialThread
 from parser import Parser
 
-from utils import crc16_ccitt  # 如果 utils.py 在同级目录
+from utils import crc16_ccitt, RingBuffer  # 如果 utils.py 在同级目录
+import utils_numba  # numba 缺失时自动回退到 NumPy 路径
 
 # default parameters
 DEFAULT_SAMPLING_RATE = 120  # samples per second (editable)
 DEFAULT_WINDOW_SECONDS = 5  # seconds
 MAX_POINTS_LIMIT = 200000  # safety cap
+USE_OPENGL = True  # GPU 光栅化绘图（需 pyopengl）；显卡/驱动有问题时改为 False
 
 # ----------------- 自定义底部刻度轴（只显示整秒或 1 位小数） -----------------
 class TimeAxis(pg.AxisItem):
@@ -68,11 +69,15 @@ class MainWindow(QWidget):
         self.serial_thread = SerialThread()
         self.parser = Parser()
 
+        # 预热 JIT 内核（无 numba 时为空操作）
+        utils_numba.warmup()
+
         # parameters
         self.sampling_rate = DEFAULT_SAMPLING_RATE
         self.time_window = DEFAULT_WINDOW_SECONDS
         self.adc_bits = 8      # default ADC bits (10-bit -> 0..1023)
         self.vref = 5         # default reference voltage
+        self._rebuild_adc_lut()
 
         # 心率算法参数（可根据实际信号调整）
         self.r_threshold_ratio = 0.45  # R波检测阈值比例（0.5-0.8，无滤波时建议调大）
@@ -81,20 +86,41 @@ class MainWindow(QWidget):
         # plotting buffers
         self._recreate_buffers()
 
-        # timestamps queue for sample-rate calc
-        self.sample_times = deque()
+        # 复用的样点序号数组：免得每个串口包都重新分配一个 arange
+        self._idx_cache = np.arange(4096, dtype=np.float64)
+
 
-        # raw text buffer for popup (limited lines)
-        self.raw_buffer = deque(maxlen=400)  # store recent raw lines / hex strings
+        # raw bytes buffer for popup (limited chunks)
+        # 存原始字节前缀（append 近乎零开销），HEX/TEXT 格式化推迟到弹窗展示时
+        self.raw_buffer = deque(maxlen=400)
 
         # CSV writer (None when not writing)
         self.csv_file = None
         self.csv_writer = None
+        self._csv_pending = []  # 待落盘的行，按 on_timer 节拍批量写出
 
         # vertical pan/zoom state (in volts)
         self.v_offset = 0.0           # vertical offset center shift (V)
         self.v_range_factor = 1.05    # multiplier for Vref to set half-range
 
+        # 坐标范围缓存：X 轴记录上次值，Y 轴用脏标记（参数回调里置位），
+        # 未变化的帧跳过 set*Range 以省掉整帧重绘
+        self._last_xrange = None
+        self._yaxis_dirty = True
+
+        # 降采样桶数（按绘图区像素宽），resizeEvent 里更新
+        self._plot_width = 1000
+
+        # R波检测限频：BPM 的变化尺度是秒级，每 250ms 检测一次并缓存结果
+        self._last_detect_ts = 0.0
+        self._cached_analysis = (None, [], None)
+
+        # 采样率统计：累计收样计数 + 上次读数，差分求速率，O(1) 不碰缓冲区
+        self._rx_count = 0
+        self._rate_last_count = 0
+        self._rate_last_t = time.perf_counter()
+        self._sample_rate = 0.0
+
         self.raw_dialog = None  # lazily created
 
         self._setup_ui()
@@ -111,6 +137,24 @@ class MainWindow(QWidget):
         # 初始化 BPM 显示
         self.update_bpm(None)
 
+    def _rebuild_adc_lut(self):
+        """重建 ADC→电压查表和派生常量：一次 fancy-index 代替逐样点换算。
+        16 位以上（>65536 码值）不建表，退回算术路径。"""
+        # 以 (位数, 参考电压) 为键，参数没变就不重建
+        key = (self.adc_bits, self.vref)
+        if getattr(self, '_adc_lut_key', None) == key:
+            return
+        self._adc_lut_key = key
+        max_code = (1 << self.adc_bits) - 1
+        self._max_code = max_code
+        self._v_per_code = float(self.vref) / max_code if max_code > 0 else 0.0
+        # 8 位以内：一个字节一个样点，频繁路径免去位宽分支；LUT 仅 256 项常驻 L1
+        self._is_u8 = self.adc_bits <= 8
+        if self.adc_bits <= 16:
+            self._adc_lut = np.arange(max_code + 1, dtype=np.float32) * np.float32(self._v_per_code)
+        else:
+            self._adc_lut = None
+
     def _recreate_buffers(self):
         """(Re)create plot buffers based on current time_window and sampling_rate"""
         pts = int(self.time_window * max(1, self.sampling_rate))
@@ -118,8 +162,18 @@ class MainWindow(QWidget):
             pts = 1
         if pts > MAX_POINTS_LIMIT:
             pts = MAX_POINTS_LIMIT
-        self.plot_x = deque(maxlen=pts)
-        self.plot_y = deque(maxlen=pts)
+        # 预分配 NumPy 环形缓冲：写入按切片批量完成，读取是连续视图
+        self.plot_x = RingBuffer(pts, dtype=np.float64)   # 时间戳
+        self.plot_y = RingBuffer(pts, dtype=np.uint16)    # ADC 原始值
+
+    def _buffer_append(self, ts, adc):
+        """成对批量写入两个环形缓冲"""
+        self.plot_x.extend(ts)
+        self.plot_y.extend(adc)
+
+    def _buffer_views(self):
+        """按时间顺序返回 (timestamps, adc) 两个数组"""
+        return self.plot_x.view(), self.plot_y.view()
 
     def _setup_ui(self):
         # Top controls (一行，整体放大)
@@ -222,8 +276,20 @@ class MainWindow(QWidget):
         pg.setConfigOption('background', 'w')
         pg.setConfigOption('foreground', 'k')
 
+        # OpenGL 后端：曲线在 GPU 上光栅化，绕开每帧的 QPainterPath 构建
+        self._opengl_ok = False
+        if USE_OPENGL:
+            try:
+                import OpenGL  # noqa: F401
+                pg.setConfigOption('useOpenGL', True)
+                pg.setConfigOption('enableExperimental', True)
+                self._opengl_ok = True
+            except Exception:
+                pass
+
         bottom_axis = TimeAxis(orientation='bottom')
-        self.plot_widget = pg.PlotWidget(title="实时心率/脉搏波形", axisItems={'bottom': bottom_axis})
+        self.plot_widget = pg.PlotWidget(title="实时心率/脉搏波形", axisItems={'bottom': bottom_axis},
+                                         useOpenGL=self._opengl_ok)
         self.plot_widget.setBackground('w')
         self.plot_widget.showGrid(x=True, y=True, alpha=0.3)
         self.plot_widget.setLabel('left', 'Voltage', units='V')
@@ -233,10 +299,7 @@ class MainWindow(QWidget):
         self.curve = self.plot_widget.plot([], [], pen=pg.mkPen(color=(200, 20, 20), width=4), antialias=False)
         # R波峰值标记曲线（绿色圆点）
         self.r_peak_curve = self.plot_widget.plot([], [], pen=None, symbol='o', symbolSize=8, symbolBrush='g')
-        try:
-            self.curve.setDownsampling(auto=True, method='mean')
-        except Exception:
-            pass
+        # 降采样改在 on_timer 里做 min/max（pyqtgraph 自带的 'mean' 会抹掉 R 波尖峰）
 
         self.plot_widget.enableAutoRange(False)
 
@@ -339,6 +402,8 @@ class MainWindow(QWidget):
         total_h = self.height()
         target = max(200, int(total_h * 2 / 3))
         self.plot_widget.setMinimumHeight(target)
+        # 降采样桶数只在窗口尺寸变化时更新
+        self._plot_width = max(100, self.plot_widget.width())
         super().resizeEvent(event)
 
     def _connect_signals(self):
@@ -361,7 +426,6 @@ class MainWindow(QWidget):
         self.btn_range_up.clicked.connect(lambda: self._zoom_range(1.12))
         self.btn_range_down.clicked.connect(lambda: self._zoom_range(1/1.12))
 
-        self.serial_thread.bytes_received.connect(self.on_bytes)
         self.serial_thread.error.connect(self.on_error)
         # 额外绑定打开/关闭信号以更新按钮颜色和状态
         self.serial_thread.opened.connect(self.on_port_opened)
@@ -439,8 +503,18 @@ class MainWindow(QWidget):
     def on_error(self, msg):
         self.status_label.setText("错误: " + msg)
 
+    def _format_preview(self, chunk: bytes) -> str:
+        """把一段原始字节格式化成预览行（先截断再格式化，HEX 走 C 实现的 bytes.hex）"""
+        if self.display_mode_combo.currentText() == "HEX":
+            return chunk[:67].hex(' ').upper()[:200]
+        try:
+            txt = chunk.decode('utf-8', errors='ignore')
+        except:
+            txt = str(chunk)
+        return txt.replace('\r', '').replace('\n', '\\n')[:200]
+
     def on_show_raw(self):
-        txt = "\n".join(list(self.raw_buffer))
+        txt = "\n".join(self._format_preview(c) for c in self.raw_buffer)
         if self.raw_dialog is None or not self.raw_dialog.isVisible():
             self.raw_dialog = RawDialog(self, initial_text=txt)
             self.raw_dialog.show()
@@ -462,17 +536,22 @@ class MainWindow(QWidget):
 
     def on_adc_bits_changed(self, v):
         self.adc_bits = int(v)
+        self._rebuild_adc_lut()
 
     def on_vref_changed(self, v):
         self.vref = float(v)
+        self._rebuild_adc_lut()
+        self._yaxis_dirty = True
 
     # 绘图缩放/平移
     def _pan_vertical(self, direction: int):
         step = self.vref * 0.06
         self.v_offset += direction * step
+        self._yaxis_dirty = True
 
     def _reset_pan(self):
         self.v_offset = 0.0
+        self._yaxis_dirty = True
 
     def _zoom_range(self, factor: float):
         self.v_range_factor *= factor
@@ -480,125 +559,179 @@ class MainWindow(QWidget):
             self.v_range_factor = 0.4
         if self.v_range_factor > 4.0:
             self.v_range_factor = 4.0
+        self._yaxis_dirty = True
 
     # 数据接收
     def on_bytes(self, b: bytes):
         if not b:
             return
 
-        mode = self.display_mode_combo.currentText()
-        if mode == "HEX":
-            preview = ' '.join(f'{x:02X}' for x in b)[:200]
-        else:
-            try:
-                txt = b.decode('utf-8', errors='ignore')
-            except:
-                txt = str(b)
-            preview = txt.replace('\r', '').replace('\n', '\\n')[:200]
-        self.raw_buffer.append(preview)
+        # 只存字节前缀（预览最多 200 字符），格式化推迟到 on_show_raw
+        self.raw_buffer.append(b[:200])
 
         now = time.time()
-        n = len(b)
+        if self._is_u8:
+            # 特化路径：8 位 ADC 一字节一样点，零拷贝视图直接入环形缓冲
+            samples = np.frombuffer(b, dtype=np.uint8)
+        else:
+            # 9~16 位：按协议小端 u16 成对解码（奇数尾字节丢弃）
+            samples = np.frombuffer(b, dtype='<u2', count=len(b) // 2)
+        n = samples.size
+        if n == 0:
+            return
 
         if self.sampling_rate and self.sampling_rate > 0:
             dt = 1.0 / float(self.sampling_rate)
         else:
             dt = 0.0
 
-        base_offset = (n - 1) * dt
-        for i, byte in enumerate(b):
-            ts = now - (base_offset - i * dt)
-            adc = int(byte)
-            self.plot_x.append(ts)
-            self.plot_y.append(adc)
-            self.sample_times.append(ts)
-            if self.csv_writer:
-                voltage = self._adc_to_voltage(adc)
-                try:
-                    self.csv_writer.writerow([f"{ts:.6f}", int(adc), f"{voltage:.6f}"])
-                except Exception:
-                    pass
+        # 整包时间戳一次算出，整包写入环形缓冲
+        if n > self._idx_cache.size:
+            self._idx_cache = np.arange(n, dtype=np.float64)
+        ts = now + (self._idx_cache[:n] - (n - 1)) * dt
+        self._buffer_append(ts, samples)
+        self._rx_count += n
+
+        if self.csv_writer:
+            # 接收路径只暂存数组（零拷贝/零装箱），格式化推迟到 _flush_csv 批量完成
+            if self._adc_lut is not None:
+                # 样点可能超过 max_code（协议噪声或刚调小位数时的旧数据），clip 到表尾
+                voltages = self._adc_lut.take(samples, mode='clip')
+            else:
+                voltages = samples.astype(np.float32) * np.float32(self._v_per_code)
+            self._csv_pending.append((ts, samples, voltages))
 
     # ------------------- 心率算法核心（无滤波） -------------------
     def detect_r_peaks(self, raw_data, fs):
-        r_peak_indices = []
-        n = len(raw_data)
+        # 向量化实现：逐样点比较全部交给 NumPy（C 层 SIMD），
+        # Python 层只扫描为数不多的候选峰做不应期抑制
+        y = np.asarray(raw_data, dtype=np.float32)
+        n = y.size
         if n < 3:
-            return r_peak_indices
+            return []
 
         if fs <= 0:
             fs = self.sampling_rate if self.sampling_rate > 0 else 120
 
         min_interval_points = max(1, int(round(self.min_r_interval * fs)))
+        min_thr_offset = 0.005 * (self.vref if self.vref else 1.0)
 
-        vmin = min(raw_data)
-        vmax = max(raw_data)
-        vmean = sum(raw_data) / n
+        # 优先走 Numba 原生代码路径（已在启动时预热编译）：
+        # min/max/mean 与阈值推导在内核里单趟扫描完成
+        if utils_numba.detect_r_peaks_nb is not None:
+            y = np.ascontiguousarray(y)
+            peaks = utils_numba.detect_r_peaks_nb(
+                y, np.float32(self.r_threshold_ratio),
+                np.float32(min_thr_offset), min_interval_points)
+            return peaks.tolist()
+
+        vmin = float(y.min())
+        vmax = float(y.max())
+        vmean = float(y.mean())
         amp = vmax - vmin
         if amp <= 1e-9:
-            return r_peak_indices
+            return []
 
         thr = vmean + float(self.r_threshold_ratio) * (vmax - vmean)
-        min_thr_offset = 0.005 * (self.vref if self.vref else 1.0)
         if thr - vmin < min_thr_offset:
             thr = vmin + min_thr_offset
 
+        # 局部极大值（左严格、右非严格）且高于阈值
+        mid = y[1:-1]
+        mask = (mid > thr) & (mid > y[:-2]) & (mid >= y[2:])
+        candidates = np.flatnonzero(mask) + 1
+
+        # 不应期抑制：候选峰通常只有几十个，纯 Python 遍历足够快
+        r_peak_indices = []
         last_peak = -min_interval_points * 2
-        for i in range(1, n - 1):
-            val = raw_data[i]
-            if val <= thr:
-                continue
-            if val > raw_data[i - 1] and val >= raw_data[i + 1]:
-                if (i - last_peak) >= min_interval_points:
-                    r_peak_indices.append(i)
-                    last_peak = i
+        for i in candidates:
+            if (i - last_peak) >= min_interval_points:
+                r_peak_indices.append(int(i))
+                last_peak = i
 
         return r_peak_indices
 
-    def _estimate_bpm_from_wave(self, voltages, rel_xs):
+    def _analyze_wave(self, voltages, rel_xs):
+        """R波只检测一次，返回 (bpm 或 None, 峰索引列表, 平均RR间期或 None)，
+        供 BPM 显示、峰值标记和周期显示共用"""
         fs = self.sampling_rate
         n = len(voltages)
         if fs <= 0 or n < 3:
-            return None
+            return None, [], None
 
         peaks = self.detect_r_peaks(voltages, fs)
         if len(peaks) < 2:
-            return None
-
-        peak_times = [rel_xs[i] for i in peaks]
-        intervals = [peak_times[i] - peak_times[i - 1] for i in range(1, len(peak_times))]
-        if not intervals:
-            return None
-
-        avg = sum(intervals) / len(intervals)
-        filtered = [it for it in intervals if 0.5 * avg <= it <= 1.5 * avg]
-        if not filtered:
-            return None
-
-        mean_interval = sum(filtered) / len(filtered)
-        if mean_interval <= 0:
-            return None
+            return None, peaks, None
 
-        bpm = 60.0 / mean_interval
-        if 30 <= bpm <= 220:
-            return int(round(bpm))
+        # RR 间期统计走 JIT 内核（无 numba 时回退 np.diff 向量化实现）
+        peak_times = np.asarray(rel_xs, dtype=np.float64)[np.asarray(peaks, dtype=np.intp)]
+        if utils_numba.rr_stats_nb is not None:
+            avg, mean_interval = utils_numba.rr_stats_nb(peak_times)
         else:
-            return None
+            intervals = np.diff(peak_times)
+            avg = float(intervals.mean())
+            filtered = intervals[(intervals >= 0.5 * avg) & (intervals <= 1.5 * avg)]
+            mean_interval = float(filtered.mean()) if filtered.size else 0.0
+
+        bpm = None
+        if mean_interval > 0:
+            value = 60.0 / mean_interval
+            if 30 <= value <= 220:
+                bpm = int(round(value))
+        return bpm, peaks, avg
 
     # 数据转换与绘图
     def _adc_to_voltage(self, adc_raw: int) -> float:
-        max_code = (1 << self.adc_bits) - 1
-        if max_code <= 0:
-            return 0.0
-        return float(adc_raw) / float(max_code) * float(self.vref)
+        # 标度常量在 _rebuild_adc_lut 里预先算好，这里只剩一次乘法
+        return float(adc_raw) * self._v_per_code
+
+    @staticmethod
+    def _downsample_minmax(xs, ys, width):
+        """保峰值降采样：按像素分桶，每桶输出 (min, max) 两个点。
+        顶点数从 O(样点) 降到 O(2×像素)，R 波尖峰不丢失"""
+        n = ys.size
+        k = n // width           # 每桶样点数（调用方保证 >= 4）
+        m = width * k
+        yb = ys[:m].reshape(width, k)
+        out_y = np.empty(width * 2, dtype=ys.dtype)
+        out_y[0::2] = yb.min(axis=1)
+        out_y[1::2] = yb.max(axis=1)
+        out_x = np.repeat(xs[:m:k], 2)
+        if m < n:
+            # 不足一桶的尾巴原样附上，避免窗口右端缺一截
+            out_x = np.concatenate((out_x, xs[m:]))
+            out_y = np.concatenate((out_y, ys[m:]))
+        return out_x, out_y
+
+    def _flush_csv(self):
+        """把暂存的数组段一次写出（写盘失败不影响采集）"""
+        if self.csv_writer and self._csv_pending:
+            try:
+                for ts, samples, voltages in self._csv_pending:
+                    np.savetxt(self.csv_file, np.column_stack([ts, samples, voltages]),
+                               fmt=['%.6f', '%d', '%.6f'], delimiter=',')
+            except Exception:
+                pass
+            self._csv_pending.clear()
 
     def on_timer(self):
-        # 更新采样率显示
+        # 批量取走串口线程积压的数据：每个 UI 帧一次，而不是每个串口包一个跨线程信号
+        data = self.serial_thread.read_pending()
+        if data:
+            self.on_bytes(data)
+
+        # 批量落盘 CSV（约 20 次/秒，而不是每个串口包一次）
+        self._flush_csv()
+
+        # 更新采样率显示：累计计数差分，O(1)，不再在时间戳数组上二分
         now = time.time()
-        cutoff = now - 1.0
-        while self.sample_times and self.sample_times[0] < cutoff:
-            self.sample_times.popleft()
-        sample_rate = len(self.sample_times) / 1.0
+        t = time.perf_counter()
+        elapsed = t - self._rate_last_t
+        if elapsed >= 1.0:
+            self._sample_rate = (self._rx_count - self._rate_last_count) / elapsed
+            self._rate_last_count = self._rx_count
+            self._rate_last_t = t
+        sample_rate = self._sample_rate
 
         # 更新状态
         port_info = "未连接"
@@ -608,54 +741,63 @@ class MainWindow(QWidget):
         except:
             port_info = "未连接"
         base_status = f"状态: {'已打开 ' + port_info if port_info != '未连接' else '未连接'}"
-        self.status_label.setText(f"{base_status}    采样率: {sample_rate:.1f} sps")
+        status = f"{base_status}    采样率: {sample_rate:.1f} sps"
+        dropped = self.serial_thread.dropped_bytes
+        if dropped:
+            status += f"    丢弃: {dropped} B"
+        self.status_label.setText(status)
 
-        if not self.plot_x:
+        if len(self.plot_x) == 0:
             return
+        xs_all, ys_all_raw = self._buffer_views()
 
-        # 提取窗口内数据
-        latest_ts = self.plot_x[-1]
+        # 提取窗口内数据：时间戳单调递增，二分定位窗口起点后取两个连续切片
+        latest_ts = xs_all[-1]
         start_ts = latest_ts - self.time_window
-        abs_xs = []
-        ys = []
-        for ts, adc in zip(self.plot_x, self.plot_y):
-            if ts >= start_ts:
-                abs_xs.append(ts)
-                ys.append(self._adc_to_voltage(int(adc)))
-
-        if not abs_xs:
+        idx = np.searchsorted(xs_all, start_ts, side='left')
+        abs_xs = xs_all[idx:]
+        if abs_xs.size == 0:
             return
-
-        # 绘制原始波形
-        rel_xs = [t - start_ts for t in abs_xs]
-        self.curve.setData(rel_xs, ys)
+        if self._adc_lut is not None:
+            # mode='clip'：超量程码值按满量程处理，不让越界索引抛异常
+            ys = self._adc_lut.take(ys_all_raw[idx:], mode='clip')
+        else:
+            ys = ys_all_raw[idx:].astype(np.float32) * np.float32(self._v_per_code)
+
+        # 绘制原始波形（float32 连续数组直接进 pyqtgraph 的快路径，无列表转换）
+        # 样点数远超像素数时先做保峰值的 min/max 降采样，只给绘图用；
+        # 心率分析仍然在全分辨率数组上进行
+        rel_xs = (abs_xs - start_ts).astype(np.float32)
+        width = self._plot_width
+        if ys.size > 4 * width:
+            plot_x, plot_y = self._downsample_minmax(rel_xs, ys, width)
+        else:
+            plot_x, plot_y = rel_xs, ys
+        self.curve.setData(x=plot_x, y=plot_y)
 
         # 计算峰峰值
         try:
-            p2p = max(ys) - min(ys)
+            p2p = float(ys.max() - ys.min())
             self.peak_to_peak_label.setText(f"Pk-Pk: {p2p:.2f} V")
         except Exception:
             self.peak_to_peak_label.setText("Pk-Pk: -- V")
 
-        # 检测R波并计算心率与周期
+        # 检测R波并计算心率与周期（限频 ~4Hz，一次检测结果共用）
         r_peak_bpm = None
         period_text = "--"
         if len(ys) > 0:
-            # 估计 BPM
-            r_peak_bpm = self._estimate_bpm_from_wave(ys, rel_xs)
-            # 得到峰索引并计算平均周期
-            r_peak_indices = self.detect_r_peaks(ys, self.sampling_rate)
-            if r_peak_indices and len(r_peak_indices) >= 2:
-                peak_times = [rel_xs[i] for i in r_peak_indices]
-                intervals = [peak_times[i] - peak_times[i - 1] for i in range(1, len(peak_times))]
-                if intervals:
-                    avg_interval = sum(intervals) / len(intervals)
-                    period_text = f"{avg_interval:.2f} s"
-            # 绘制绿点
+            if now - self._last_detect_ts >= 0.25:
+                self._cached_analysis = self._analyze_wave(ys, rel_xs)
+                self._last_detect_ts = now
+            r_peak_bpm, r_peak_indices, avg_interval = self._cached_analysis
+            if avg_interval is not None:
+                period_text = f"{avg_interval:.2f} s"
+            # 绘制绿点（峰索引 fancy-index，免建 Python 列表）；
+            # 缓存的索引来自至多 250ms 前的窗口，截掉可能越界的部分
             if r_peak_indices:
-                r_peak_x = [rel_xs[i] for i in r_peak_indices]
-                r_peak_y = [ys[i] for i in r_peak_indices]
-                self.r_peak_curve.setData(r_peak_x, r_peak_y)
+                idx = np.asarray(r_peak_indices, dtype=np.intp)
+                idx = idx[idx < ys.size]
+                self.r_peak_curve.setData(x=rel_xs[idx], y=ys[idx])
             else:
                 self.r_peak_curve.setData([], [])
 
@@ -663,29 +805,35 @@ class MainWindow(QWidget):
         self.update_bpm(r_peak_bpm)
         self.period_label.setText(f"周期: {period_text}")
 
-        # 固定X轴范围
-        try:
-            self.plot_widget.setXRange(0, self.time_window, padding=0)
-        except Exception:
-            pass
+        # 固定X轴范围（setXRange/setYRange 每次都会触发重绘，范围没变就不调）
+        if self.time_window != self._last_xrange:
+            try:
+                self.plot_widget.setXRange(0, self.time_window, padding=0)
+                self._last_xrange = self.time_window
+            except Exception:
+                pass
 
-        # 固定Y轴范围
-        mid = (self.vref / 2.0) + self.v_offset
-        half_range = (self.vref / 2.0) * self.v_range_factor
-        ymin = mid - half_range
-        ymax = mid + half_range
-        if ymin < -self.vref * 2:
-            ymin = -self.vref * 2
-        if ymax > self.vref * 3:
-            ymax = self.vref * 3
-        self.plot_widget.setYRange(ymin, ymax, padding=0.01)
+        # 固定Y轴范围：只有相关参数（vref/偏移/缩放）变过才重算并 setYRange
+        if self._yaxis_dirty:
+            mid = (self.vref / 2.0) + self.v_offset
+            half_range = (self.vref / 2.0) * self.v_range_factor
+            ymin = mid - half_range
+            ymax = mid + half_range
+            if ymin < -self.vref * 2:
+                ymin = -self.vref * 2
+            if ymax > self.vref * 3:
+                ymax = self.vref * 3
+            self.plot_widget.setYRange(ymin, ymax, padding=0.01)
+            self._yaxis_dirty = False
 
     # 其他UI功能
     def clear_display(self):
         self.raw_buffer.clear()
         self.plot_x.clear()
         self.plot_y.clear()
-        self.sample_times.clear()
+        self._cached_analysis = (None, [], None)
+        self._last_detect_ts = 0.0
+        self._sample_rate = 0.0
         self.curve.setData([], [])
         self.r_peak_curve.setData([], [])
         self.peak_to_peak_label.setText("Pk-Pk: -- V")
@@ -698,20 +846,26 @@ class MainWindow(QWidget):
         if not path:
             return
         try:
+            xs_all, ys_all = self._buffer_views()
+            if self._adc_lut is not None:
+                voltages = self._adc_lut.take(ys_all, mode='clip')
+            else:
+                voltages = ys_all.astype(np.float32) * np.float32(self._v_per_code)
             with open(path, 'w', newline='') as f:
-                w = csv.writer(f)
-                w.writerow(['timestamp', 'adc_raw', 'voltage_V'])
-                for ts, adc in zip(self.plot_x, self.plot_y):
-                    voltage = self._adc_to_voltage(int(adc))
-                    w.writerow([f"{ts:.6f}", int(adc), f"{voltage:.6f}"])
+                f.write('timestamp,adc_raw,voltage_V\n')
+                # 整个缓冲一次 savetxt，格式化与写出都在 C 层完成
+                np.savetxt(f, np.column_stack([xs_all, ys_all, voltages]),
+                           fmt=['%.6f', '%d', '%.6f'], delimiter=',')
             self.status_label.setText("导出成功: " + path)
         except Exception as e:
             self.status_label.setText("导出失败: " + str(e))
 
     def closeEvent(self, event):
         self.serial_thread.close()
+        self._flush_csv()
         try:
             if self.csv_file:
+                self.csv_file.flush()
                 self.csv_file.close()
         except:
             pass
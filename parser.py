@@ -5,81 +5,96 @@
 # [0xAA][0x55][LEN(1)][TYPE(1)][PAYLOAD..LEN bytes][CRC16 (2 bytes, little-endian)]
 #
 # TYPE == 0x01 -> ADC 数据：payload 为重复的 (sample_id:u16 LE, adc:u16 LE) 对
-# 支持粘包/拆包，并返回解析好的样本列表。
+# 支持粘包/拆包。feed 返回 (sample_ids, adcs, frames) —— 两个 uint16 数组加帧列表，
+# 不再为每个样点建一个 dict（高采样率下 dict/装箱 int 的分配开销很可观）。
 
-from collections import deque
-from typing import List, Dict
+from typing import List, Tuple
+import numpy as np
 from utils import crc16_ccitt
 import struct
 
 HEADER = b'\xAA\x55'
 HEADER_LEN = 2
+MIN_FRAME_LEN = HEADER_LEN + 1 + 1 + 2  # header + LEN + TYPE + CRC
+
+# 预编译 Struct，省掉每帧重复的格式串解析和属性查找
+_UNPACK_CRC = struct.Struct('<H').unpack_from
+
+# 读指针越过该值后才整理缓冲（del 前缀是 O(n) 拷贝，不能每帧做）
+_COMPACT_THRESHOLD = 4096
+
+_EMPTY_U16 = np.empty(0, dtype='<u2')
 
 class Parser:
-    def __init__(self):
+    def __init__(self, keep_frames: bool = False):
         self.buffer = bytearray()
+        self._read_pos = 0  # 已消费字节的游标，代替逐帧 del 前缀
+        # 调试时置 True：ADC 帧的原始字节也会出现在 frames 里
+        self.keep_frames = keep_frames
 
-    def feed(self, data: bytes) -> List[Dict]:
+    def feed(self, data: bytes) -> Tuple[np.ndarray, np.ndarray, List[bytes]]:
         """
-        Feed raw bytes, return list of parsed samples.
-        Each parsed sample is a dict: {'timestamp': None, 'sample_id': int, 'adc': int, 'raw_frame': bytes}
+        Feed raw bytes, return (sample_ids, adcs, frames).
+        sample_ids/adcs 为 uint16 数组（一一对应）；frames 为未知 TYPE 的原始帧
+        （keep_frames=True 时也包含 ADC 帧）。
         """
         self.buffer.extend(data)
-        results = []
+        id_chunks = []
+        adc_chunks = []
+        frames = []
+        buf = self.buffer
+        pos = self._read_pos
 
-        # try to find frame start
         while True:
-            if len(self.buffer) < HEADER_LEN + 1 + 1 + 2:  # header + len + type + crc
+            if len(buf) - pos < MIN_FRAME_LEN:
                 break
             # find header
-            idx = self.buffer.find(HEADER)
+            idx = buf.find(HEADER, pos)
             if idx == -1:
                 # drop all before possible header
-                self.buffer.clear()
+                pos = len(buf)
                 break
-            if idx > 0:
-                # discard leading bytes
-                del self.buffer[:idx]
-            # now header at 0
-            if len(self.buffer) < 4:
+            pos = idx
+            # now header at pos
+            if len(buf) - pos < 4:
                 break  # wait for len/type
-            length = self.buffer[2]  # LEN byte
+            length = buf[pos + 2]  # LEN byte
             total_len = HEADER_LEN + 1 + 1 + length + 2  # header + LEN + TYPE + payload + crc
-            if len(self.buffer) < total_len:
+            if len(buf) - pos < total_len:
                 break  # wait for full frame
-            frame = bytes(self.buffer[:total_len])
+            frame = bytes(buf[pos:pos + total_len])
             # compute crc over LEN..PAYLOAD
-            crc_field = frame[-2:]  # little-endian
-            payload_for_crc = frame[2:-2]  # from LEN through payload inclusive
-            calc = crc16_ccitt(payload_for_crc)
-            recv_crc = struct.unpack('<H', crc_field)[0]
+            calc = crc16_ccitt(frame[2:-2])
+            recv_crc = _UNPACK_CRC(frame, total_len - 2)[0]
             if calc != recv_crc:
-                # CRC fail -> discard header byte and resync
-                # to avoid infinite loop, drop first byte and continue
-                del self.buffer[0]
+                # CRC fail -> advance one byte and resync
+                pos += 1
                 continue
             # CRC OK -> parse TYPE & PAYLOAD
             typ = frame[3]
             payload = frame[4:-2]
             if typ == 0x01:
                 # payload is multiple of 4 bytes: sample_id (u16 LE) + adc (u16 LE)
-                n = len(payload) // 4
-                for i in range(n):
-                    off = i * 4
-                    sample_id, adc = struct.unpack_from('<HH', payload, off)
-                    results.append({
-                        'sample_id': int(sample_id),
-                        'adc': int(adc),
-                        'raw_frame': frame,
-                    })
+                pairs = np.frombuffer(payload, dtype='<u2', count=(len(payload) // 4) * 2)
+                id_chunks.append(pairs[0::2])
+                adc_chunks.append(pairs[1::2])
+                if self.keep_frames:
+                    frames.append(frame)
             else:
-                # unknown TYPE: return raw frame as single entry
-                results.append({
-                    'sample_id': None,
-                    'adc': None,
-                    'type': typ,
-                    'raw_frame': frame,
-                })
-            # remove processed bytes
-            del self.buffer[:total_len]
-        return results
+                # unknown TYPE: return raw frame for the caller to inspect
+                frames.append(frame)
+            # advance past processed frame
+            pos += total_len
+
+        self._read_pos = pos
+        if pos > _COMPACT_THRESHOLD:
+            del buf[:pos]
+            self._read_pos = 0
+
+        if id_chunks:
+            sample_ids = np.concatenate(id_chunks)
+            adcs = np.concatenate(adc_chunks)
+        else:
+            sample_ids = _EMPTY_U16
+            adcs = _EMPTY_U16
+        return sample_ids, adcs, frames
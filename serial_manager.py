@@ -1,15 +1,16 @@
 # serial_manager.py
 # 这里放串口管理代码
 # serial_manager.py
-# 串口读线程（QThread 版本），向主线程发射接收到的原始 bytes
+# 串口读线程（QThread 版本），接收到的原始 bytes 存入积压队列，
+# 由 GUI 的定时器批量取走（read_pending），不再每包发一个跨线程信号
 
+from collections import deque
 from PyQt5.QtCore import QThread, pyqtSignal
 import serial
 import serial.tools.list_ports
 import time
 
 class SerialThread(QThread):
-    bytes_received = pyqtSignal(bytes)
     error = pyqtSignal(str)
     opened = pyqtSignal()
     closed = pyqtSignal()
@@ -20,7 +21,28 @@ class SerialThread(QThread):
         self._running = False
         self.port = None
         self.baud = 115200
-        self.read_interval = 0.02  # 20ms
+        self.retry_interval = 0.5  # 读出错后的重试间隔
+        # 单生产者（本线程）单消费者（GUI）；CPython 的 deque append/popleft 是原子的
+        self._pending = deque()
+        # 积压上限（字节）：GUI 卡顿时丢最旧数据而不是无限占内存；
+        # 计数器在两个线程间有良性竞争，只作近似界与统计用
+        self.max_pending_bytes = 1 << 20
+        self._pending_bytes = 0
+        self.dropped_bytes = 0
+
+    def read_pending(self) -> bytes:
+        """取走并拼接积压的接收数据；无数据返回 b''。由 GUI 定时器调用"""
+        if not self._pending:
+            return b''
+        chunks = []
+        while self._pending:
+            try:
+                chunks.append(self._pending.popleft())
+            except IndexError:
+                break
+        data = b''.join(chunks)
+        self._pending_bytes -= len(data)
+        return data
 
     @staticmethod
     def list_ports():
@@ -56,23 +78,33 @@ class SerialThread(QThread):
         self.closed.emit()
 
     def run(self):
-        # thread main loop: read bytes and emit
+        # thread main loop: 阻塞等第一个字节（pyserial 内部 select，0.1s 超时便于退出），
+        # 到数后一次排空接收缓冲整块入队——不再按 20ms 轮询节拍空转
         try:
             while self._running:
                 try:
-                    if self._ser and self._ser.is_open:
-                        n = self._ser.in_waiting
-                        if n:
-                            data = self._ser.read(n)
-                            if data:
-                                self.bytes_received.emit(data)
-                        else:
-                            time.sleep(self.read_interval)
+                    ser = self._ser
+                    if ser and ser.is_open:
+                        first = ser.read(1)
+                        if not first:
+                            continue
+                        n = ser.in_waiting
+                        data = first + ser.read(n) if n else first
+                        self._pending.append(data)
+                        self._pending_bytes += len(data)
+                        # 超出预算丢最旧的整包（消费端同时在 popleft，IndexError 说明已被取空）
+                        while self._pending_bytes > self.max_pending_bytes:
+                            try:
+                                old = self._pending.popleft()
+                            except IndexError:
+                                break
+                            self._pending_bytes -= len(old)
+                            self.dropped_bytes += len(old)
                     else:
                         time.sleep(0.1)
                 except Exception as e:
                     self.error.emit(str(e))
-                    time.sleep(0.5)
+                    time.sleep(self.retry_interval)
         finally:
             # ensure closed
             try:
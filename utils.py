@@ -3,17 +3,136 @@
 # utils.py
 # 辅助函数：CRC16-CCITT 等
 
-def crc16_ccitt(data: bytes, poly: int = 0x1021, init_val: int = 0xFFFF) -> int:
+import binascii
+
+import numpy as np
+
+
+class RingBuffer:
     """
-    CRC-16/CCITT-FALSE implementation
+    定长 NumPy 环形缓冲（dvg-ringbuffer 的轻量自实现）：
+    extend 批量切片写入，view 返回按写入顺序排列的数组（仅回绕后拼接一次）。
+    """
+
+    def __init__(self, capacity: int, dtype):
+        self.capacity = int(capacity)
+        self._buf = np.empty(self.capacity, dtype=dtype)
+        self._head = 0    # 下一写入位置
+        self._count = 0   # 当前有效元素数
+
+    def __len__(self):
+        return self._count
+
+    def clear(self):
+        self._head = 0
+        self._count = 0
+
+    def extend(self, values):
+        """批量写入（回绕时拆成两段切片拷贝）；超过容量只保留最新数据"""
+        n = len(values)
+        cap = self.capacity
+        if n >= cap:
+            self._buf[:] = values[-cap:]
+            self._head = 0
+            self._count = cap
+            return
+        h = self._head
+        first = min(n, cap - h)
+        self._buf[h:h + first] = values[:first]
+        rest = n - first
+        if rest:
+            self._buf[:rest] = values[first:]
+        self._head = (h + n) % cap
+        self._count = min(cap, self._count + n)
+
+    def view(self):
+        """按写入顺序返回数组：未回绕/头部对齐时是零拷贝视图"""
+        if self._count < self.capacity:
+            return self._buf[:self._count]
+        h = self._head
+        if h == 0:
+            return self._buf
+        return np.concatenate((self._buf[h:], self._buf[:h]))
+
+try:
+    # Rust 后端，x86 上用 PCLMULQDQ 折叠、ARM 上用 PMULL，吞吐远高于查表 C 实现
+    from fastcrc.crc16 import xmodem as _crc16_fast
+except ImportError:
+    _crc16_fast = None
+
+
+def _crc16_ccitt_py(data: bytes, poly: int = 0x1021, init_val: int = 0xFFFF) -> int:
+    """
+    CRC-16/CCITT 纯 Python 实现，查 256 项表、每字节一次迭代
+    （代替逐位算法的每字节 8 次移位+异或）。仅作回退与自检用。
     Returns 16-bit integer.
     """
+    table = _crc_table(poly)
     crc = init_val
     for b in data:
-        crc ^= b << 8
-        for _ in range(8):
-            if crc & 0x8000:
-                crc = ((crc << 1) & 0xFFFF) ^ poly
-            else:
-                crc = (crc << 1) & 0xFFFF
-    return crc & 0xFFFF
+        crc = ((crc << 8) & 0xFFFF) ^ table[(crc >> 8) ^ b]
+    return crc
+
+
+_CRC_TABLES = {}
+
+
+def _crc_table(poly: int) -> tuple:
+    """按多项式生成并缓存 256 项 CRC 查找表"""
+    table = _CRC_TABLES.get(poly)
+    if table is None:
+        entries = []
+        for byte in range(256):
+            crc = byte << 8
+            for _ in range(8):
+                if crc & 0x8000:
+                    crc = ((crc << 1) & 0xFFFF) ^ poly
+                else:
+                    crc = (crc << 1) & 0xFFFF
+            entries.append(crc)
+        table = tuple(entries)
+        _CRC_TABLES[poly] = table
+    return table
+
+
+def crc16_ccitt(data: bytes, poly: int = 0x1021, init_val: int = 0xFFFF) -> int:
+    """
+    CRC-16/CCITT-FALSE implementation
+    标准多项式 0x1021 时优先走 fastcrc（SIMD carry-less multiply），
+    没装 fastcrc 则走 C 实现的 binascii.crc_hqx（同一算法，无逐字节 Python 循环），
+    非标准多项式回退到纯 Python 参考实现。
+    Returns 16-bit integer.
+    """
+    if poly == 0x1021:
+        if _crc16_fast is not None:
+            # XMODEM 与 CCITT-FALSE 同多项式，仅初值不同，用 initial 参数对齐
+            return _crc16_fast(bytes(data), init_val)
+        return binascii.crc_hqx(data, init_val)
+    return _crc16_ccitt_py(data, poly, init_val)
+
+
+# 导入时一次性校验 crc_hqx 与参考实现等价（CRC-16/CCITT-FALSE 标准校验值 0x29B1）
+assert binascii.crc_hqx(b'123456789', 0xFFFF) == _crc16_ccitt_py(b'123456789') == 0x29B1
+
+
+if __name__ == '__main__':
+    # 各实现等价性自检 + 简单测速（手动运行：python utils.py）
+    import os
+    import time
+
+    frames = [os.urandom(64) for _ in range(1000)]
+    for f in frames:
+        ref = _crc16_ccitt_py(f)
+        assert binascii.crc_hqx(f, 0xFFFF) == ref
+        if _crc16_fast is not None:
+            assert _crc16_fast(f, 0xFFFF) == ref
+    print("equivalence OK on 1000 random frames "
+          f"(fastcrc: {'yes' if _crc16_fast else 'no'})")
+
+    for name, fn in [("python", _crc16_ccitt_py),
+                     ("crc_hqx", lambda d: binascii.crc_hqx(d, 0xFFFF)),
+                     ("active", crc16_ccitt)]:
+        t0 = time.perf_counter()
+        for f in frames:
+            fn(f)
+        print(f"{name:8s}: {(time.perf_counter() - t0) * 1e6 / len(frames):8.2f} us/frame")
@@ -0,0 +1,88 @@
+# utils_numba.py
+# 可选的 Numba JIT 加速内核
+# numba 未安装时 detect_r_peaks_nb 为 None，调用方回退到 NumPy 向量化实现
+
+import numpy as np
+
+try:
+    from numba import njit
+    HAVE_NUMBA = True
+except ImportError:
+    njit = None
+    HAVE_NUMBA = False
+
+
+if HAVE_NUMBA:
+    @njit(cache=True, fastmath=True, nogil=True)
+    def detect_r_peaks_nb(y, r_threshold_ratio, min_thr_offset, min_interval_points):
+        """
+        R波检测内核：三点局部极大（左严格、右非严格）+ 阈值 + 不应期抑制。
+        min/max/mean 在同一次内存扫描里融合算出（阈值推导也在内核里完成），
+        y 为 contiguous float32 数组，返回峰索引 int32 数组。
+        """
+        n = y.shape[0]
+        # 融合归约：一趟扫描同时得到 min / max / sum
+        vmin = y[0]
+        vmax = y[0]
+        s = 0.0
+        for i in range(n):
+            v = y[i]
+            s += v
+            if v < vmin:
+                vmin = v
+            elif v > vmax:
+                vmax = v
+        if vmax - vmin <= 1e-9:
+            return np.empty(0, np.int32)
+        vmean = s / n
+
+        thr = vmean + r_threshold_ratio * (vmax - vmean)
+        if thr - vmin < min_thr_offset:
+            thr = vmin + min_thr_offset
+
+        out = np.empty(n, np.int32)
+        m = 0
+        last_peak = -2 * min_interval_points
+        for i in range(1, n - 1):
+            v = y[i]
+            if v > thr and v > y[i - 1] and v >= y[i + 1]:
+                if i - last_peak >= min_interval_points:
+                    out[m] = i
+                    m += 1
+                    last_peak = i
+        return out[:m]
+
+    @njit(cache=True, fastmath=True, nogil=True)
+    def rr_stats_nb(peak_times):
+        """
+        RR 间期统计：返回 (全部间期均值, 0.5~1.5 倍均值内的过滤均值)。
+        峰不足或过滤后为空时对应值为 0.0。
+        """
+        n = peak_times.shape[0]
+        if n < 2:
+            return 0.0, 0.0
+        s = 0.0
+        for i in range(1, n):
+            s += peak_times[i] - peak_times[i - 1]
+        avg = s / (n - 1)
+        fsum = 0.0
+        fcnt = 0
+        for i in range(1, n):
+            it = peak_times[i] - peak_times[i - 1]
+            if 0.5 * avg <= it <= 1.5 * avg:
+                fsum += it
+                fcnt += 1
+        if fcnt == 0:
+            return avg, 0.0
+        return avg, fsum / fcnt
+else:
+    detect_r_peaks_nb = None
+    rr_stats_nb = None
+
+
+def warmup():
+    """启动时用小数组触发一次编译，避免首次真实调用承担 JIT 编译开销"""
+    if detect_r_peaks_nb is not None:
+        dummy = np.zeros(8, dtype=np.float32)
+        detect_r_peaks_nb(dummy, np.float32(0.45), np.float32(0.025), 2)
+        rr_stats_nb(np.arange(4, dtype=np.float64))
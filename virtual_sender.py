@@ -17,21 +17,30 @@ from utils import crc16_ccitt
 
 HEADER = b'\xAA\x55'
 
+# 预编译 Struct，绑定一次 pack_into 省去循环里的格式串解析
+_PACK_SAMPLE = struct.Struct('<HH').pack_into
+_PACK_LEN_TYPE = struct.Struct('<BB').pack_into
+_PACK_CRC = struct.Struct('<H').pack_into
+
 def make_frame(samples):
     # samples: list of (sample_id:int, adc:int)
-    payload = bytearray()
-    for sid, adc in samples:
-        payload += struct.pack('<HH', sid & 0xFFFF, adc & 0xFFFF)
-    length = len(payload) + 0  # payload length (TYPE byte separate)
-    typ = 0x01
     # frame = header + LEN + TYPE + payload + CRC16(LEN..payload)
-    header_and_len_type_payload = bytearray()
-    header_and_len_type_payload += bytes([length])
-    header_and_len_type_payload += bytes([typ])
-    header_and_len_type_payload += payload
-    crc = crc16_ccitt(header_and_len_type_payload)
-    frame = HEADER + header_and_len_type_payload + struct.pack('<H', crc)
-    return frame
+    # 按最终长度一次分配，pack_into 定点写入，避免循环里 bytearray += 反复扩容拷贝
+    if len(samples) > 63:
+        # LEN 是单字节，payload 最多 255 字节（63 个样点）；静默回绕会发出
+        # 接收端只会 CRC 拒收的坏帧，这里直接报错
+        raise ValueError(f"每帧最多 63 个样点（got {len(samples)}）")
+    payload_len = 4 * len(samples)
+    buf = bytearray(2 + 1 + 1 + payload_len + 2)
+    buf[0:2] = HEADER
+    _PACK_LEN_TYPE(buf, 2, payload_len, 0x01)
+    off = 4
+    for sid, adc in samples:
+        _PACK_SAMPLE(buf, off, sid & 0xFFFF, adc & 0xFFFF)
+        off += 4
+    crc = crc16_ccitt(bytes(buf[2:off]))
+    _PACK_CRC(buf, off, crc)
+    return bytes(buf)
 
 def main():
     parser = argparse.ArgumentParser()
@@ -39,6 +48,7 @@ def main():
     parser.add_argument('baud', type=int, help='波特率，例如 115200')
     parser.add_argument('--rate', type=int, default=100, help='发送速率 (samples/s)')
     parser.add_argument('--samples-per-frame', type=int, default=1, help='每帧包含样点数')
+    parser.add_argument('--frames-per-write', type=int, default=16, help='每次 write 合并的帧数')
     parser.add_argument('--max-adc', type=int, default=1023, help='adc 最大值')
     args = parser.parse_args()
 
@@ -52,18 +62,30 @@ def main():
     sample_id = 0
     try:
         interval = 1.0 / args.rate
+        batch_period = interval * args.samples_per_frame * args.frames_per_write
+        # 按绝对截止时刻调度：sleep(固定间隔) 会把构帧/写串口的耗时累加成漂移，
+        # 这里每轮推进 next_t 并只睡剩余时间，长期平均速率严格等于 --rate
+        next_t = time.perf_counter()
         while True:
-            samples = []
-            for _ in range(args.samples_per_frame):
-                sample_id = (sample_id + 1) & 0xFFFF
-                # 模拟一个简单的正弦或渐变信号，这里用 saw
-                adc = int((sample_id % (args.max_adc + 1)))
-                samples.append((sample_id, adc))
-            frame = make_frame(samples)
-            ser.write(frame)
-            # optional: flush for demo
-            ser.flush()
-            time.sleep(interval * args.samples_per_frame)
+            # 合并多帧一次 write：每帧一个系统调用在高速率下是瓶颈；
+            # 不再逐帧 flush，节奏交给 OS 的发送 FIFO
+            frames = []
+            for _ in range(args.frames_per_write):
+                samples = []
+                for _ in range(args.samples_per_frame):
+                    sample_id = (sample_id + 1) & 0xFFFF
+                    # 模拟一个简单的正弦或渐变信号，这里用 saw
+                    adc = int((sample_id % (args.max_adc + 1)))
+                    samples.append((sample_id, adc))
+                frames.append(make_frame(samples))
+            ser.write(b''.join(frames))
+            next_t += batch_period
+            delay = next_t - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            elif delay < -0.5:
+                # 落后太多（串口阻塞等）就放弃追赶，重置基准避免之后突发补发
+                next_t = time.perf_counter()
     except KeyboardInterrupt:
         print("停止发送")
     finally: